@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Optional, Any, ClassVar
 from .locks import LockManager
 
 @dataclass
@@ -7,6 +7,8 @@ class LockedContextMixin:
     """
     Mixin that hooks __setattr__ to enforce LockManager policy.
     """
+    # Tag checked by POPEngine to find lockable layers (cheaper than hasattr probes)
+    _pop_lockable: ClassVar[bool] = True
     _lock_manager: Optional[LockManager] = field(default=None, repr=False, init=False)
 
     def set_lock_manager(self, manager: LockManager):
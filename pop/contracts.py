@@ -1,21 +1,59 @@
-from typing import List, Optional, Callable, Dict
+from typing import List, Optional, Callable, Dict, FrozenSet, Iterable, Tuple, Type, Union
+import builtins
 import functools
 import inspect
+import weakref
+
+# An entry of errors=[...]: an exception name ("ValueError") or the class itself
+ErrorSpec = Union[str, Type[BaseException]]
+
+# Identical input/output signatures share one frozenset across all contracts
+_SIGNATURE_INTERN: "weakref.WeakValueDictionary[tuple, FrozenSet[str]]" = weakref.WeakValueDictionary()
+
+def _intern_signature(names: Iterable[str]) -> FrozenSet[str]:
+    key = tuple(sorted(set(names)))
+    return _SIGNATURE_INTERN.setdefault(key, frozenset(key))
 
 class ContractViolationError(Exception):
     """Raised when a Process violates its declared POP Contract."""
     pass
 
+def _resolve_error(spec: ErrorSpec) -> Optional[type]:
+    """
+    Map an errors=[...] entry to its exception class (builtins only for names).
+    Unknown names return None and are matched by name instead.
+    """
+    if isinstance(spec, type):
+        if not issubclass(spec, BaseException):
+            raise TypeError(f"errors=[...] entries must be exception classes, got class '{spec.__name__}'")
+        return spec
+    if not isinstance(spec, str):
+        raise TypeError(f"errors=[...] entries must be exception names or classes, got {spec!r}")
+    cls = getattr(builtins, spec, None)
+    if isinstance(cls, type) and issubclass(cls, BaseException):
+        return cls
+    return None
+
 class ProcessContract:
-    def __init__(self, inputs: List[str], outputs: List[str], side_effects: List[str] = None, errors: List[str] = None):
+    def __init__(self, inputs: List[str], outputs: List[str], side_effects: List[str] = None, errors: List[ErrorSpec] = None):
         self.inputs = inputs
         self.outputs = outputs
         self.side_effects = side_effects or []
         self.errors = errors or []
+        # Membership sets used by POPEngine / ContextGuard (interned, shared between contracts)
+        self._input_set = _intern_signature(inputs)
+        self._output_set = _intern_signature(outputs)
+        # Declared errors: resolved to classes where possible, plus the names given as strings
+        # (a declared class is matched by class only, never by a same-named exception)
+        resolved = [_resolve_error(e) for e in self.errors]
+        self._error_set = frozenset(e for e in self.errors if isinstance(e, str))
+        self._error_types: FrozenSet[type] = frozenset(c for c in resolved if c is not None)
+        self._error_classes: Tuple[type, ...] = tuple(self._error_types)
 
-def process(inputs: List[str], outputs: List[str], side_effects: List[str] = None, errors: List[str] = None):
+def process(inputs: List[str], outputs: List[str], side_effects: List[str] = None, errors: List[ErrorSpec] = None):
     """
     Decorator để định nghĩa một POP Process với I/O Contract rõ ràng.
+    errors=[...] accepts exception names or exception classes.
     """
     def decorator(func: Callable):
         func._pop_contract = ProcessContract(inputs, outputs, side_effects, errors)
@@ -1,30 +1,226 @@
 from dataclasses import dataclass, field
-from typing import Any, List, Dict, Optional, Union
+from typing import Any, List, Dict, Optional, Tuple, Union
 import copy
+import sys
+from collections.abc import MutableSequence
 
-@dataclass
+# A path is stored as a tuple of segments, e.g. ("domain.list", 0, "name").
+# The first segment is the root attribute path; str segments render as ".key",
+# everything else as "[key]". Strings are only built on demand.
+PathParts = Tuple[Any, ...]
+
+def render_path(parts: PathParts) -> str:
+    """
+    Render a tuple path to its string form, e.g. "domain.list[0].name".
+    """
+    if not parts:
+        return ""
+    out = [str(parts[0])]
+    for seg in parts[1:]:
+        if isinstance(seg, str):
+            out.append(".")
+            out.append(seg)
+        else:
+            out.append("[")
+            out.append(str(seg))
+            out.append("]")
+    return "".join(out)
+
+# slots=True is only available on Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(init=False, **_DATACLASS_SLOTS)
 class DeltaEntry:
     """
     Represent a single atomic change in the system.
+    The path may be given as a tuple of segments or, as before, a plain string
+    (positionally or as path=...); a string is stored as a one-segment tuple.
     """
-    path: str           # e.g. "domain.q_table", "domain.list[0]"
+    path_parts: PathParts  # e.g. ("domain.q_table",), ("domain.list", 0)
     op: str             # "SET", "APPEND", "EXTEND", "POP", "REMOVE", "CLEAR", "UPDATE"
     value: Any = None   # The new value (for SET, APPEND) or argument
     old_value: Any = None # The previous value (for Undo/Rollback)
     target: Any = None    # Reference to the object being modified (Transient, for Rollback)
     key: Any = None       # Attribute name or Index (Transient, for Rollback)
 
+    def __init__(self, path_parts: Union[str, PathParts] = None, op: str = None, value: Any = None,
+                 old_value: Any = None, target: Any = None, key: Any = None, *, path: Optional[str] = None):
+        if path is not None:
+            if path_parts is not None:
+                raise TypeError("DeltaEntry() got both 'path_parts' and 'path'")
+            path_parts = path
+        if path_parts is None or op is None:
+            raise TypeError("DeltaEntry() requires a path and an op")
+        if isinstance(path_parts, str):
+            path_parts = (path_parts,)
+        self.path_parts = path_parts
+        self.op = op
+        self.value = value
+        self.old_value = old_value
+        self.target = target
+        self.key = key
+
+    @property
+    def path(self) -> str:
+        # e.g. "domain.q_table", "domain.list[0]"
+        return render_path(self.path_parts)
+
+def render_paths(paths: List[PathParts]) -> List[str]:
+    """
+    Render many paths at once. Paths logged through the same wrapper share
+    their prefix, so each distinct prefix is rendered only once.
+    """
+    cache: Dict[PathParts, str] = {}
+
+    def render(parts: PathParts) -> str:
+        text = cache.get(parts)
+        if text is None:
+            if len(parts) <= 1:
+                text = render_path(parts)
+            else:
+                seg = parts[-1]
+                if isinstance(seg, str):
+                    text = render(parts[:-1]) + "." + seg
+                else:
+                    text = render(parts[:-1]) + "[" + str(seg) + "]"
+            cache[parts] = text
+        return text
+
+    out = []
+    for parts in paths:
+        try:
+            out.append(render(parts))
+        except TypeError: # Unhashable segment (e.g. a slice)
+            out.append(render_path(parts))
+    return out
+
+# Op codes stored in the DeltaLog (small ints instead of strings)
+OP_NAMES = ("SET", "REMOVE", "APPEND", "EXTEND", "POP", "INSERT", "CLEAR", "UPDATE")
+OP_SET, OP_REMOVE, OP_APPEND, OP_EXTEND, OP_POP, OP_INSERT, OP_CLEAR, OP_UPDATE = range(len(OP_NAMES))
+_OP_CODES = {name: code for code, name in enumerate(OP_NAMES)}
+
+class DeltaLog(MutableSequence):
+    """
+    Mutation log. Hot-path records are stored as plain tuples:
+    (op_code, path_parts, value, old_value, target, key).
+    A tuple is turned into a DeltaEntry (in place) the first time the log
+    is inspected, so entries keep their identity and edits, as in a list.
+    Entries added through the list API are stored as-is.
+    """
+    def __init__(self):
+        self._records: List[Any] = []
+
+    def record(self, op: int, path_parts: PathParts, value: Any = None, old_value: Any = None, target: Any = None, key: Any = None):
+        self._records.append((op, path_parts, value, old_value, target, key))
+
+    def append(self, entry: DeltaEntry):
+        self._records.append(entry)
+
+    def extend(self, entries):
+        self._records.extend(entries)
+
+    def insert(self, index: int, entry: DeltaEntry):
+        self._records.insert(index, entry)
+
+    def clear(self):
+        self._records.clear()
+
+    def copy(self) -> List[DeltaEntry]:
+        return list(self)
+
+    def paths(self) -> List[str]:
+        """
+        Rendered path of every entry, in log order.
+        """
+        return render_paths([r[1] if type(r) is tuple else r.path_parts for r in self._records])
+
+    @staticmethod
+    def _to_entry(record: tuple) -> DeltaEntry:
+        op, path_parts, value, old_value, target, key = record
+        # Op codes from record(); any other op is kept as given
+        return DeltaEntry(path_parts, OP_NAMES[op] if type(op) is int else op, value, old_value, target, key)
+
+    @staticmethod
+    def _to_record(rec: Any) -> tuple:
+        if type(rec) is tuple:
+            return rec
+        return (_OP_CODES.get(rec.op, rec.op), rec.path_parts, rec.value, rec.old_value, rec.target, rec.key)
+
+    def _entry(self, index: int) -> DeltaEntry:
+        rec = self._records[index]
+        if type(rec) is tuple:
+            rec = self._records[index] = self._to_entry(rec)
+        return rec
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self._records)))]
+        return self._entry(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+        self._records[index] = value
+
+    def __delitem__(self, index):
+        del self._records[index]
+
+    def __iter__(self):
+        for i in range(len(self._records)):
+            yield self._entry(i)
+
+    def __reversed__(self):
+        for i in range(len(self._records) - 1, -1, -1):
+            yield self._entry(i)
+
+    def __eq__(self, other):
+        if isinstance(other, DeltaLog):
+            other = list(other)
+        elif not isinstance(other, list):
+            return NotImplemented
+        return list(self) == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
 class Transaction:
     # ... (init and shadow cache stay same) ...
     def __init__(self, system_ctx_root: Any):
         self.root = system_ctx_root
-        self.delta_log: List[DeltaEntry] = []
+        self.delta_log = DeltaLog()
+        # Hot-path logger: record(op_code, path_parts, value, old_value, target, key)
+        self.record = self.delta_log.record
         self._shadow_cache: Dict[int, tuple] = {}
         self._shadow_ids: set = set() # Track IDs of created shadows
+        # Tracked/Frozen wrappers keyed by (wrapper list class, id(shadow)), reused across reads
+        self._wrappers: Dict[tuple, Any] = {}
 
     def log(self, entry: DeltaEntry):
         self.delta_log.append(entry)
         
+    def wrap(self, shadow_child: Any, path: PathParts, list_cls: type, dict_cls: type) -> Any:
+        """
+        Wrap a shadowed list/dict in list_cls/dict_cls, reusing the wrapper
+        created by an earlier read of the same node.
+        """
+        key = (list_cls, id(shadow_child))
+        wrapper = self._wrappers.get(key)
+        # Same node reached through a different path gets its own wrapper
+        if wrapper is None or wrapper._path != path:
+            if isinstance(shadow_child, list):
+                wrapper = list_cls(shadow_child, self, path)
+            elif isinstance(shadow_child, dict):
+                wrapper = dict_cls(shadow_child, self, path)
+            else:
+                return shadow_child
+            self._wrappers[key] = wrapper
+        return wrapper
+
     def get_shadow(self, original_obj: Any) -> Any:
         obj_id = id(original_obj)
         
@@ -73,6 +269,8 @@ class Transaction:
             elif isinstance(original, dict):
                 original.clear()
                 original.update(shadow) # Replace content
+
+        self._wrappers.clear()
                 
     def rollback(self):
         """
@@ -81,15 +279,16 @@ class Transaction:
         For Shadows: Just discard them (Original was untouched).
         """
         # Revert Optimistic Writes
-        for entry in reversed(self.delta_log):
-            if entry.op == "SET" and entry.target is not None:
+        for op, _, _, old_value, target, key in map(DeltaLog._to_record, reversed(self.delta_log._records)):
+            if op == OP_SET and target is not None:
                 # Revert attribute or item set
-                if isinstance(entry.key, str): # Attribute
-                    setattr(entry.target, entry.key, entry.old_value)
+                if isinstance(key, str): # Attribute
+                    setattr(target, key, old_value)
                 else: # Index/Key? Usually SET is for attributes in guards.py
                     # Structures.py handles Lists differently (Shadows).
                     pass
         
         self.delta_log.clear()
         self._shadow_cache.clear()
+        self._wrappers.clear()
 
@@ -1,5 +1,7 @@
 import os
-from typing import Dict, Callable, Any, Optional
+import dataclasses
+from typing import Dict, Callable, Any, Optional, Tuple
+import json
 import logging
 import yaml
 from contextlib import contextmanager
@@ -9,12 +11,51 @@ from .guards import ContextGuard
 from .delta import Transaction
 from .locks import LockManager
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError: # PyYAML built without libyaml
+    from yaml import SafeLoader as _YAMLLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("POPEngine")
 
+# Max number of parsed workflows kept in POPEngine._WF_CACHE
+_WF_CACHE_SIZE = 256
+
+def _steps_from_def(workflow_def: Any):
+    """
+    Yield process names from a parsed workflow document.
+    Steps are either plain strings or mappings with a `process` key.
+    """
+    if not isinstance(workflow_def, dict):
+        return
+    steps = workflow_def.get('steps')
+    if not isinstance(steps, list):
+        return
+    for step in steps:
+        if isinstance(step, str):
+            yield step
+        elif isinstance(step, dict):
+            process_name = step.get('process')
+            if process_name:
+                yield process_name
+
 class POPEngine:
+    # Parsed workflows: absolute path -> ((mtime_ns, size), step names). Shared across engines.
+    _WF_CACHE: Dict[str, Tuple[Tuple[int, int], Tuple[str, ...]]] = {}
+
     def __init__(self, system_ctx: BaseSystemContext, strict_mode: Optional[bool] = None):
-        self.ctx = system_ctx
+        self._ctx = system_ctx
         self.process_registry: Dict[str, Callable] = {}
+        # Dispatch tables, precomputed at registration:
+        # processes without a contract run directly on the context,
+        # contracted ones get a dispatcher closure (see _build_dispatcher).
+        self._plain: Dict[str, Callable] = {}
+        self._contracted: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
         
         # Resolve Strict Mode Logic
         # Priority 1: Argument (if explicit True/False)
@@ -28,86 +69,156 @@ class POPEngine:
         self.lock_manager = LockManager(strict_mode=strict_mode)
         
         # Attach Lock to Contexts
-        # Note: We must attach to ALL layers recursively if possible, or at least the standard 3.
-        # Check if they are compatible (inherit from LockedContextMixin)
-        if hasattr(self.ctx, 'set_lock_manager'):
-            self.ctx.set_lock_manager(self.lock_manager)
-            
-        if hasattr(self.ctx.global_ctx, 'set_lock_manager'):
-            self.ctx.global_ctx.set_lock_manager(self.lock_manager)
-            
-        if hasattr(self.ctx.domain_ctx, 'set_lock_manager'):
-            self.ctx.domain_ctx.set_lock_manager(self.lock_manager)
+        # The standard 3 layers first, then any extra dataclass layers (recursively).
+        # Compatible layers inherit from LockedContextMixin (tagged with _pop_lockable).
+        seen = set()
+        for layer in (self.ctx, self.ctx.global_ctx, self.ctx.domain_ctx):
+            self._attach_lock(layer, seen)
+
+    @property
+    def ctx(self) -> BaseSystemContext:
+        return self._ctx
+
+    @ctx.setter
+    def ctx(self, system_ctx: BaseSystemContext):
+        self._ctx = system_ctx
+        # Dispatcher closures bind the context: rebuild them so plain and
+        # contracted processes keep running on the same one
+        for name in self._contracted:
+            func = self.process_registry[name]
+            self._contracted[name] = self._build_dispatcher(name, func, func._pop_contract)
+
+    def _attach_lock(self, obj: Any, seen: set):
+        if not getattr(obj, '_pop_lockable', False) or id(obj) in seen:
+            return
+        seen.add(id(obj))
+        obj.set_lock_manager(self.lock_manager)
+        
+        for f in dataclasses.fields(obj):
+            self._attach_lock(getattr(obj, f.name, None), seen)
 
     def register_process(self, name: str, func: Callable):
-        if not hasattr(func, '_pop_contract'):
+        contract: Optional[ProcessContract] = getattr(func, '_pop_contract', None)
+        if contract is None:
             logger.warning(f"Process {name} does not have a contract decorator (@process). Safety checks disabled.")
+            self._contracted.pop(name, None)
+            self._plain[name] = func
+        else:
+            self._plain.pop(name, None)
+            self._contracted[name] = self._build_dispatcher(name, func, contract)
         self.process_registry[name] = func
 
-    def run_process(self, name: str, **kwargs):
+    def _build_dispatcher(self, name: str, func: Callable, contract: ProcessContract) -> Callable[[Dict[str, Any]], Any]:
         """
-        Thực thi một process theo tên đăng ký.
+        Build the runner for a contracted process. Everything it needs is bound
+        once here as closure variables, so a call does no attribute lookups on
+        the engine or the contract. The caller must already hold the unlock.
         """
-        if name not in self.process_registry:
-            raise KeyError(f"Process '{name}' not found in registry.")
-        
-        func = self.process_registry[name]
-        
-        # UNLOCK CONTEXT for Process execution
-        with self.lock_manager.unlock():
-            # Checking Contract (Runtime validation)
-            if hasattr(func, '_pop_contract'):
-                contract: ProcessContract = func._pop_contract
+        ctx = self._ctx
+        allowed_inputs = contract._input_set
+        allowed_outputs = contract._output_set
+        error_types = contract._error_types
+        error_classes = contract._error_classes
+        error_names = contract._error_set
+
+        def dispatch(kwargs: Dict[str, Any]):
+            # Create Transaction
+            tx = Transaction(ctx)
+            
+            # Create Guard with Transaction
+            guarded_ctx = ContextGuard(ctx, allowed_inputs, allowed_outputs, transaction=tx)
+            
+            try:
+                result = func(guarded_ctx, **kwargs)
                 
-                allowed_inputs = set(contract.inputs)
-                allowed_outputs = set(contract.outputs)
+                # Commit Changes if successful
+                tx.commit()
+                return result
                 
-                # Create Transaction
-                tx = Transaction(self.ctx)
+            except Exception as e:
+                # Rollback Changes if error
+                tx.rollback()
                 
-                # Create Guard with Transaction
-                guarded_ctx = ContextGuard(self.ctx, allowed_inputs, allowed_outputs, transaction=tx)
+                # Wrap error if it's strictly contract related, otherwise re-raise
+                if isinstance(e, ContractViolationError):
+                     raise ContractViolationError(f"[Process: {name}] {str(e)}") from e
                 
-                try:
-                    result = func(guarded_ctx, **kwargs)
-                    
-                    # Commit Changes if successful
-                    tx.commit()
-                    return result
-                    
-                except Exception as e:
-                    # Rollback Changes if error
-                    tx.rollback()
-                    
-                    # Wrap error if it's strictly contract related, otherwise re-raise
-                    if isinstance(e, ContractViolationError):
-                         raise ContractViolationError(f"[Process: {name}] {str(e)}") from e
-                    
-                    # Error Trap for undeclared errors
-                    error_name = type(e).__name__
-                    if error_name not in contract.errors:
-                        raise ContractViolationError(
-                            f"Undeclared Error Violation: Process '{name}' raised '{error_name}' "
-                            f"but it was not declared in errors=[...]. Original Error: {str(e)}"
-                        ) from e
-                    raise e
+                # Error Trap for undeclared errors
+                # Exact class first, then declared name (custom exceptions), then subclasses
+                error_type = type(e)
+                if not (error_type in error_types
+                        or error_type.__name__ in error_names
+                        or isinstance(e, error_classes)):
+                    error_name = error_type.__name__
+                    raise ContractViolationError(
+                        f"Undeclared Error Violation: Process '{name}' raised '{error_name}' "
+                        f"but it was not declared in errors=[...]. Original Error: {str(e)}"
+                    ) from e
+                raise e
+
+        return dispatch
+
+    def run_process(self, name: str, **kwargs):
+        """
+        Thực thi một process theo tên đăng ký.
+        """
+        # UNLOCK CONTEXT for Process execution
+        with self.lock_manager.unlock():
+            return self._run_process_inner(name, kwargs)
+
+    def _run_process_inner(self, name: str, kwargs: Dict[str, Any]):
+        """
+        Run a process assuming the context is already unlocked by the caller.
+        """
+        func = self._plain.get(name)
+        if func is not None:
+            return func(self._ctx, **kwargs)
+
+        try:
+            dispatch = self._contracted[name]
+        except KeyError:
+            raise KeyError(f"Process '{name}' not found in registry.") from None
+        return dispatch(kwargs)
+
+    def _load_workflow(self, workflow_path: str) -> Tuple[str, ...]:
+        """
+        Parse a workflow file into a tuple of process names.
+        Result is cached until the file's mtime or size changes.
+        """
+        # Absolute path: a relative path names a different file after os.chdir
+        key = os.path.abspath(workflow_path)
+        st = os.stat(key)
+        # Size as well: coarse-timestamp filesystems can keep mtime across an edit
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._WF_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        with open(key, 'rb') as f:
+            if workflow_path.endswith('.json'):
+                data = f.read()
+                workflow_def = orjson.loads(data) if orjson is not None else json.loads(data)
             else:
-                return func(self.ctx, **kwargs)
+                # Full load (aliases, merge keys); the cache keeps this to once per file change
+                workflow_def = yaml.load(f, Loader=_YAMLLoader)
+            steps = tuple(_steps_from_def(workflow_def))
+
+        if len(self._WF_CACHE) >= _WF_CACHE_SIZE and key not in self._WF_CACHE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._WF_CACHE[next(iter(self._WF_CACHE))]
+        self._WF_CACHE[key] = (stamp, steps)
+        return steps
 
     def execute_workflow(self, workflow_path: str, **kwargs):
         """
-        Thực thi Workflow YAML.
+        Thực thi Workflow YAML (or JSON, for paths ending in .json).
         """
-        with open(workflow_path, 'r', encoding='utf-8') as f:
-            workflow_def = yaml.safe_load(f)
-            
-        for step in workflow_def.get('steps', []):
-            if isinstance(step, str):
-                self.run_process(step, **kwargs)
-            elif isinstance(step, dict):
-                process_name = step.get('process')
-                if process_name:
-                    self.run_process(process_name, **kwargs)
+        steps = self._load_workflow(workflow_path)
+
+        # Single unlock for the whole workflow instead of one per step
+        with self.lock_manager.unlock():
+            for process_name in steps:
+                self._run_process_inner(process_name, kwargs)
         
         return self.ctx
 
@@ -1,6 +1,6 @@
 from typing import Any, Set, Optional
 from .contracts import ContractViolationError
-from .delta import Transaction, DeltaEntry
+from .delta import Transaction, OP_SET
 from .structures import TrackedList, TrackedDict, FrozenList, FrozenDict
 
 class ContextGuard:
@@ -8,13 +8,18 @@ class ContextGuard:
     A runtime proxy that enforces POP Contracts (Read/Write permissions)
     AND facilitates Transactional Mutation (Delta Logging).
     """
+    __slots__ = ('_target_obj', '_allowed_inputs', '_allowed_outputs', '_dot_prefix', '_transaction', '_layers')
+
     def __init__(self, target_obj: Any, allowed_inputs: Set[str], allowed_outputs: Set[str], path_prefix: str = "", transaction: Optional[Transaction] = None):
         # Use object.__setattr__ to avoid recursion during init
         object.__setattr__(self, "_target_obj", target_obj)
         object.__setattr__(self, "_allowed_inputs", allowed_inputs)
         object.__setattr__(self, "_allowed_outputs", allowed_outputs)
-        object.__setattr__(self, "_path_prefix", path_prefix)
+        # "domain." (or "" at the root): full paths are built by plain concatenation
+        object.__setattr__(self, "_dot_prefix", path_prefix + "." if path_prefix else "")
         object.__setattr__(self, "_transaction", transaction)
+        # Child guards for layer containers (e.g. domain_ctx), built once per run
+        object.__setattr__(self, "_layers", {})
 
     def __getattr__(self, name: str):
         # 1. System/Magic Attribute Bypass
@@ -26,15 +31,20 @@ class ContextGuard:
         # We assume accessing a Layer Container (e.g. domain_ctx) is always allowed/safe
         # so we can traverse deeper to check the actual leaf variable.
         if name.endswith("_ctx"):
-             val = getattr(self._target_obj, name)
-             # Logic: layer name inference. 
-             # domain_ctx -> "domain"
-             next_prefix = name.replace("_ctx", "")
-             # Pass transaction down
-             return ContextGuard(val, self._allowed_inputs, self._allowed_outputs, next_prefix, self._transaction)
+             guard = self._layers.get(name)
+             if guard is None:
+                 val = getattr(self._target_obj, name)
+                 # Logic: layer name inference. 
+                 # domain_ctx -> "domain"
+                 next_prefix = name.replace("_ctx", "")
+                 # Pass transaction down
+                 guard = ContextGuard(val, self._allowed_inputs, self._allowed_outputs, next_prefix, self._transaction)
+                 self._layers[name] = guard
+             return guard
 
         # 3. Leaf / Primitive Attribute Logic
-        full_path = f"{self._path_prefix}.{name}" if self._path_prefix else name
+        full_path = self._dot_prefix + name
+        child_prefix = full_path + "."
             
         # READ GUARD
         # Rule: Full path must be in inputs OR a parent path is in inputs
@@ -45,7 +55,7 @@ class ContextGuard:
             full_path in self._allowed_inputs or 
             any(p in self._allowed_inputs for p in parent_paths) or
             # Traversal Fix: Allow if this path leads to an allowed leaf (Prefix)
-            any(inp.startswith(full_path + ".") for inp in self._allowed_inputs)
+            any(inp.startswith(child_prefix) for inp in self._allowed_inputs)
         )
         
         if not is_allowed:
@@ -60,40 +70,36 @@ class ContextGuard:
         val = getattr(self._target_obj, name)
         
         if self._transaction:
+            # Get or Create Shadow
+            shadow = self._transaction.get_shadow(val)
+
+            # Scalars and other non-containers are returned as-is (no wrapper lookup)
+            if not isinstance(shadow, (list, dict)):
+                return shadow
+
             # Check if this specific leaf path is declared as Output (Writeable)
             # Logic: If it's in Outputs, it's Mutable. If it's only in Inputs, it's Immutable.
             # CAUTION: 'full_path' might be a parent of the output. 
             # e.g. full_path="domain.list", output="domain.list" -> Mutable.
             # e.g. full_path="domain.list", output="domain.list[0]" -> Mutable (Partial).
             
+            child_prefixes = (child_prefix, full_path + "[")
             is_writeable = (
                 full_path in self._allowed_outputs or
                 # Parent of an allowed output? (e.g. accessing list to write into it)
-                any(out.startswith(full_path + ".") or out.startswith(full_path + "[") for out in self._allowed_outputs)
+                any(out.startswith(child_prefixes) for out in self._allowed_outputs)
             )
 
-            # Get or Create Shadow
-            shadow = self._transaction.get_shadow(val)
-            
             # Wrap based on permissions
-            if isinstance(shadow, list):
-                if is_writeable:
-                    return TrackedList(shadow, self._transaction, full_path)
-                else:
-                    return FrozenList(shadow, self._transaction, full_path)
-
-            elif isinstance(shadow, dict):
-                if is_writeable:
-                    return TrackedDict(shadow, self._transaction, full_path)
-                else:
-                    return FrozenDict(shadow, self._transaction, full_path)
+            if is_writeable:
+                return self._transaction.wrap(shadow, (full_path,), TrackedList, TrackedDict)
             else:
-                return shadow
+                return self._transaction.wrap(shadow, (full_path,), FrozenList, FrozenDict)
         
         return val
 
     def __setattr__(self, name: str, value: Any):
-        full_path = f"{self._path_prefix}.{name}" if self._path_prefix else name
+        full_path = self._dot_prefix + name
             
         # WRITE GUARD
         if full_path not in self._allowed_outputs:
@@ -102,6 +108,9 @@ class ContextGuard:
                 f"but it was not declared in outputs=[...]."
             )
             
+        # A replaced layer container must not be served from the cache
+        self._layers.pop(name, None)
+            
         # TRANSACTION INTEGRATION
         if self._transaction:
              old_val = getattr(self._target_obj, name, None)
@@ -130,7 +139,7 @@ class ContextGuard:
              # So:
              # 2. Perform setattr on REAL object.
              
-             self._transaction.log(DeltaEntry(full_path, "SET", value, old_val, target=self._target_obj, key=name))
+             self._transaction.record(OP_SET, (full_path,), value, old_val, self._target_obj, name)
              
              # AUTO-UNWRAP PROXY (Zombie Proxy Fix)
              # If we are assigning a TrackedList/Dict, we must store the Shadow Data, not the Wrapper.
@@ -1,21 +1,34 @@
-from typing import Any, List, Dict, Union, MutableSequence, MutableMapping
-from .delta import Transaction, DeltaEntry
+from collections.abc import Mapping, MutableSequence, MutableMapping, KeysView, ItemsView, ValuesView
+from typing import Any, List, Dict, Union
+from .delta import Transaction, PathParts, render_path, OP_SET, OP_REMOVE, OP_APPEND, OP_EXTEND, OP_POP, OP_INSERT
 from .contracts import ContractViolationError
 
-class TrackedList(MutableSequence):
+# Leaf types returned as-is by __getitem__ without touching the Transaction.
+# Exact type match (not isinstance) so list/dict subclasses still get shadowed.
+_SCALAR_TYPES = frozenset((int, float, complex, bool, str, bytes, type(None)))
+
+# Default-argument marker for pop()/lookups
+_MISSING = object()
+
+class TrackedList:
     """
     A smart wrapper around a list that logs all mutations to a Transaction.
     It operates on a 'Shadow List', ensuring isolation.
+    Registered as a virtual MutableSequence (no ABC in the MRO).
     """
-    def __init__(self, shadow_list: List, transaction: Transaction, path: str):
+    __slots__ = ('_data', '_tx', '_path', '__weakref__')
+
+    def __init__(self, shadow_list: List, transaction: Transaction, path: PathParts):
         self._data = shadow_list
         self._tx = transaction
         self._path = path
 
-    # --- MutableSequence Abstract Methods ---
-    # --- MutableSequence Abstract Methods ---
+    # --- Sequence Protocol ---
     def __getitem__(self, index):
         val = self._data[index]
+        # Fast path: plain scalars need no shadowing
+        if type(val) in _SCALAR_TYPES:
+            return val
         # Recursively wrap List/Dict
         if isinstance(val, (list, dict)):
             # 1. Get/Create Shadow for the child
@@ -26,11 +39,8 @@ class TrackedList(MutableSequence):
                  self._data[index] = shadow_child
                  
             # 3. Return Wrapped
-            child_path = f"{self._path}[{index}]"
-            if isinstance(shadow_child, list):
-                return TrackedList(shadow_child, self._tx, child_path)
-            elif isinstance(shadow_child, dict):
-                return TrackedDict(shadow_child, self._tx, child_path)
+            child_path = self._path + (index,)
+            return self._tx.wrap(shadow_child, child_path, TrackedList, TrackedDict)
                 
         return val
 
@@ -39,37 +49,76 @@ class TrackedList(MutableSequence):
         self._data[index] = value
         
         # Log Logic: path[index]
-        entry_path = f"{self._path}[{index}]"
-        self._tx.log(DeltaEntry(entry_path, "SET", value, old_val))
+        self._tx.record(OP_SET, self._path + (index,), value, old_val)
 
     def __delitem__(self, index):
         old_val = self._data[index]
         del self._data[index]
         
-        entry_path = f"{self._path}[{index}]"
-        self._tx.log(DeltaEntry(entry_path, "REMOVE", None, old_val))
+        self._tx.record(OP_REMOVE, self._path + (index,), None, old_val)
 
     def __len__(self):
         return len(self._data)
 
+    def __iter__(self):
+        # Index-based so nested containers come back wrapped
+        getitem = self.__getitem__
+        i = 0
+        try:
+            while True:
+                yield getitem(i)
+                i += 1
+        except IndexError:
+            return
+
+    def __reversed__(self):
+        getitem = self.__getitem__
+        for i in reversed(range(len(self._data))):
+            yield getitem(i)
+
+    def __contains__(self, value):
+        return value in self._data
+
+    def index(self, value, *args):
+        return self._data.index(value, *args)
+
+    def count(self, value):
+        return self._data.count(value)
+
     def insert(self, index, value):
         self._data.insert(index, value)
         # Log INSERT is complex for paths, but we simplify to "INSERT" op
-        self._tx.log(DeltaEntry(f"{self._path}", "INSERT", (index, value)))
+        self._tx.record(OP_INSERT, self._path, (index, value))
 
     # --- Optimizations / Overrides ---
     def append(self, value):
         self._data.append(value)
-        self._tx.log(DeltaEntry(self._path, "APPEND", value))
+        self._tx.record(OP_APPEND, self._path, value)
         
     def extend(self, values):
         self._data.extend(values)
-        self._tx.log(DeltaEntry(self._path, "EXTEND", values))
+        self._tx.record(OP_EXTEND, self._path, values)
         
     def pop(self, index=-1):
         val = self._data.pop(index)
-        self._tx.log(DeltaEntry(self._path, "POP", index, val))
+        self._tx.record(OP_POP, self._path, index, val)
         return val
+
+    def remove(self, value):
+        del self[self.index(value)]
+
+    def clear(self):
+        while self._data:
+            self.pop()
+
+    def reverse(self):
+        n = len(self._data)
+        for i in range(n // 2):
+            self[i], self[n - i - 1] = self[n - i - 1], self[i]
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
         
     def __repr__(self):
         return repr(self._data)
@@ -78,29 +127,30 @@ class TrackedList(MutableSequence):
         return str(self._data)
 
 
-class TrackedDict(MutableMapping):
+class TrackedDict:
     """
     A smart wrapper around a dict that logs all mutations.
+    Registered as a virtual MutableMapping (no ABC in the MRO).
     """
-    def __init__(self, shadow_dict: Dict, transaction: Transaction, path: str):
+    __slots__ = ('_data', '_tx', '_path', '__weakref__')
+
+    def __init__(self, shadow_dict: Dict, transaction: Transaction, path: PathParts):
         self._data = shadow_dict
         self._tx = transaction
         self._path = path
 
     def __getitem__(self, key):
         val = self._data[key]
+        if type(val) in _SCALAR_TYPES:
+            return val
         if isinstance(val, (list, dict)):
             shadow_child = self._tx.get_shadow(val)
             
             if shadow_child is not val:
                  self._data[key] = shadow_child
             
-            entry_path = f"{self._path}.{key}" if isinstance(key, str) else f"{self._path}[{key}]"
-            
-            if isinstance(shadow_child, list):
-                return TrackedList(shadow_child, self._tx, entry_path)
-            elif isinstance(shadow_child, dict):
-                return TrackedDict(shadow_child, self._tx, entry_path)
+            entry_path = self._path + (key,)
+            return self._tx.wrap(shadow_child, entry_path, TrackedList, TrackedDict)
                 
         return val
 
@@ -108,69 +158,142 @@ class TrackedDict(MutableMapping):
         old_val = self._data.get(key)
         self._data[key] = value
         
-        entry_path = f"{self._path}.{key}" # Dot notation for dict keys? Or ['key']?
-        # Let's use dot for string keys, bracket for others? 
-        # For simplicity in POP (which implies JSON-like context), keys are usually strings.
-        entry_path = f"{self._path}.{key}" if isinstance(key, str) else f"{self._path}[{key}]"
-        
-        op = "UPDATE" if old_val is not None else "ADD"
-        self._tx.log(DeltaEntry(entry_path, "SET", value, old_val))
+        # String keys render as ".key", others as "[key]" (see render_path)
+        self._tx.record(OP_SET, self._path + (key,), value, old_val)
 
     def __delitem__(self, key):
         old_val = self._data[key]
         del self._data[key]
         
-        entry_path = f"{self._path}.{key}" if isinstance(key, str) else f"{self._path}[{key}]"
-        self._tx.log(DeltaEntry(entry_path, "REMOVE", None, old_val))
+        self._tx.record(OP_REMOVE, self._path + (key,), None, old_val)
 
     def __iter__(self):
         return iter(self._data)
 
+    # As in Mapping: reversed() must not fall back to the sequence protocol
+    __reversed__ = None
+
     def __len__(self):
         return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        # Values go through __getitem__, so nested containers come back wrapped
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    __hash__ = None
+
+    def pop(self, key, default=_MISSING):
+        try:
+            value = self[key]
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+        del self[key]
+        return value
+
+    def popitem(self):
+        try:
+            key = next(iter(self))
+        except StopIteration:
+            raise KeyError("popitem(): dictionary is empty") from None
+        value = self[key]
+        del self[key]
+        return key, value
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
+
+    def update(self, other=(), /, **kwds):
+        if isinstance(other, Mapping):
+            for key in other:
+                self[key] = other[key]
+        elif hasattr(other, "keys"):
+            for key in other.keys():
+                self[key] = other[key]
+        else:
+            for key, value in other:
+                self[key] = value
+        for key, value in kwds.items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+        return default
         
     def __repr__(self):
         return repr(self._data)
 
+
+# isinstance(x, MutableSequence / MutableMapping) keeps working for all wrappers
+MutableSequence.register(TrackedList)
+MutableMapping.register(TrackedDict)
+
+
 class FrozenList(TrackedList):
     """
     A read-only wrapper around a list. Raises ContractViolationError on any mutation.
     """
-    def __init__(self, shadow_list: List, transaction: Transaction, path: str):
+    __slots__ = ()
+
+    def __init__(self, shadow_list: List, transaction: Transaction, path: PathParts):
         super().__init__(shadow_list, transaction, path)
 
     def __setitem__(self, index, value):
-        raise ContractViolationError(f"Immutable Violation: Cannot modify read-only input '{self._path}[{index}]'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot modify read-only input '{render_path(self._path + (index,))}'.")
 
     def __delitem__(self, index):
-        raise ContractViolationError(f"Immutable Violation: Cannot delete from read-only input '{self._path}[{index}]'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot delete from read-only input '{render_path(self._path + (index,))}'.")
 
     def insert(self, index, value):
-        raise ContractViolationError(f"Immutable Violation: Cannot insert into read-only input '{self._path}'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot insert into read-only input '{render_path(self._path)}'.")
 
     def append(self, value):
-        raise ContractViolationError(f"Immutable Violation: Cannot append to read-only input '{self._path}'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot append to read-only input '{render_path(self._path)}'.")
 
     def extend(self, values):
-        raise ContractViolationError(f"Immutable Violation: Cannot extend read-only input '{self._path}'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot extend read-only input '{render_path(self._path)}'.")
 
     def pop(self, index=-1):
-        raise ContractViolationError(f"Immutable Violation: Cannot pop from read-only input '{self._path}'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot pop from read-only input '{render_path(self._path)}'.")
     
     def __getitem__(self, index):
         # Allow reading, but recursively freeze children
         val = self._data[index]
+        if type(val) in _SCALAR_TYPES:
+            return val
         if isinstance(val, (list, dict)):
             # Even for frozen, we get a shadow to ensure we are reading consistent snapshot?
             # Yes, standard shadowing logic applies for consistency.
             shadow_child = self._tx.get_shadow(val)
             
             # Recursive Freeze
-            child_path = f"{self._path}[{index}]"
-            if isinstance(shadow_child, list):
-                return FrozenList(shadow_child, self._tx, child_path)
-            elif isinstance(shadow_child, dict):
-                return FrozenDict(shadow_child, self._tx, child_path)
+            child_path = self._path + (index,)
+            return self._tx.wrap(shadow_child, child_path, FrozenList, FrozenDict)
         return val
 
 
@@ -178,40 +301,40 @@ class FrozenDict(TrackedDict):
     """
     A read-only wrapper around a dict. Raises ContractViolationError on any mutation.
     """
-    def __init__(self, shadow_dict: Dict, transaction: Transaction, path: str):
+    __slots__ = ()
+
+    def __init__(self, shadow_dict: Dict, transaction: Transaction, path: PathParts):
         super().__init__(shadow_dict, transaction, path)
 
     def __setitem__(self, key, value):
-        entry_path = f"{self._path}.{key}" if isinstance(key, str) else f"{self._path}[{key}]"
+        entry_path = render_path(self._path + (key,))
         raise ContractViolationError(f"Immutable Violation: Cannot modify read-only input '{entry_path}'.")
 
     def __delitem__(self, key):
-        entry_path = f"{self._path}.{key}" if isinstance(key, str) else f"{self._path}[{key}]"
+        entry_path = render_path(self._path + (key,))
         raise ContractViolationError(f"Immutable Violation: Cannot delete from read-only input '{entry_path}'.")
 
     def pop(self, key, default=None):
-        entry_path = f"{self._path}.{key}" if isinstance(key, str) else f"{self._path}[{key}]"
+        entry_path = render_path(self._path + (key,))
         raise ContractViolationError(f"Immutable Violation: Cannot pop from read-only input '{entry_path}'.")
 
     def popitem(self):
-        raise ContractViolationError(f"Immutable Violation: Cannot popitem from read-only input '{self._path}'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot popitem from read-only input '{render_path(self._path)}'.")
 
     def clear(self):
-        raise ContractViolationError(f"Immutable Violation: Cannot clear read-only input '{self._path}'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot clear read-only input '{render_path(self._path)}'.")
 
     def update(self, *args, **kwargs):
-        raise ContractViolationError(f"Immutable Violation: Cannot update read-only input '{self._path}'.")
+        raise ContractViolationError(f"Immutable Violation: Cannot update read-only input '{render_path(self._path)}'.")
 
     def __getitem__(self, key):
         # Allow reading, but recursively freeze children
         val = self._data[key]
+        if type(val) in _SCALAR_TYPES:
+            return val
         if isinstance(val, (list, dict)):
             shadow_child = self._tx.get_shadow(val)
             
-            entry_path = f"{self._path}.{key}" if isinstance(key, str) else f"{self._path}[{key}]"
-            
-            if isinstance(shadow_child, list):
-                return FrozenList(shadow_child, self._tx, entry_path)
-            elif isinstance(shadow_child, dict):
-                return FrozenDict(shadow_child, self._tx, entry_path)
+            entry_path = self._path + (key,)
+            return self._tx.wrap(shadow_child, entry_path, FrozenList, FrozenDict)
         return val
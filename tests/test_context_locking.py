@@ -103,5 +103,18 @@ class TestContextLocking(unittest.TestCase):
              dom.counter = 111
              self.assertEqual(dom.counter, 111)
 
+    def test_extra_layers_are_locked(self):
+        @dataclass
+        class ExtraSystem(BaseSystemContext):
+            audit_ctx: MockDomain = field(default_factory=MockDomain)
+
+        audit = MockDomain()
+        sys = ExtraSystem(global_ctx=MockGlobal(), domain_ctx=MockDomain(), audit_ctx=audit)
+        engine = POPEngine(sys, strict_mode=True)
+
+        self.assertIs(audit._lock_manager, engine.lock_manager)
+        with self.assertRaises(LockViolationError):
+            audit.counter = 5
+
 if __name__ == "__main__":
     unittest.main()
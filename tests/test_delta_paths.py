@@ -0,0 +1,140 @@
+import unittest
+import weakref
+from types import SimpleNamespace
+from pop.delta import Transaction, DeltaEntry, render_path, OP_SET
+from pop.guards import ContextGuard
+from pop.structures import TrackedList, TrackedDict, FrozenList
+
+class TestDeltaPaths(unittest.TestCase):
+    def test_render_path(self):
+        self.assertEqual(render_path(("domain.items",)), "domain.items")
+        self.assertEqual(render_path(("domain.items", 0, "name")), "domain.items[0].name")
+        self.assertEqual(render_path(("domain.cache", 3)), "domain.cache[3]")
+        self.assertEqual(render_path(()), "")
+
+    def test_nested_mutations_log_tuple_paths(self):
+        data = {"users": [{"name": "a"}]}
+        tx = Transaction(None)
+        root = TrackedDict(tx.get_shadow(data), tx, ("domain.data",))
+
+        root["users"][0]["name"] = "b"
+        root["users"].append({"name": "c"})
+
+        self.assertEqual(tx.delta_log[0].path_parts, ("domain.data", "users", 0, "name"))
+        self.assertEqual(tx.delta_log[0].path, "domain.data.users[0].name")
+        self.assertEqual(tx.delta_log[1].op, "APPEND")
+        self.assertEqual(tx.delta_log[1].path, "domain.data.users")
+
+    def test_list_set_path(self):
+        tx = Transaction(None)
+        lst = TrackedList(tx.get_shadow([1, 2, 3]), tx, ("domain.items",))
+        lst[1] = 20
+        self.assertEqual(tx.delta_log[0].path, "domain.items[1]")
+        self.assertEqual(tx.delta_log[0].old_value, 2)
+
+    def test_scalar_reads_and_wrapper_reuse(self):
+        tx = Transaction(None)
+        root = TrackedDict(tx.get_shadow({"n": 1, "items": [1]}), tx, ("domain.data",))
+        self.assertEqual(root["n"], 1)
+
+        items = root["items"]
+        self.assertIs(root["items"], items)
+
+    def test_wrappers_are_weak_referenceable(self):
+        tx = Transaction(None)
+        for wrapper in (TrackedList([], tx, ("domain.items",)), TrackedDict({}, tx, ("domain.data",))):
+            self.assertIs(weakref.ref(wrapper)(), wrapper)
+
+    def test_guard_scalar_read_skips_wrapper_cache(self):
+        tx = Transaction(None)
+        guard = ContextGuard(SimpleNamespace(n=1, items=[1]), {"domain.n", "domain.items"}, set(), "domain", tx)
+        self.assertEqual(guard.n, 1)
+        self.assertEqual(tx._wrappers, {})
+        self.assertIsInstance(guard.items, FrozenList)
+        self.assertEqual(len(tx._wrappers), 1)
+
+    def test_tracked_dict_mapping_protocol(self):
+        tx = Transaction(None)
+        d = TrackedDict({}, tx, ("domain.data",))
+        d.update({"a": 1}, other=5)
+        self.assertEqual(d._data, {"a": 1, "other": 5})
+        with self.assertRaises(TypeError):
+            reversed(d)
+
+    def test_log_accepts_delta_entries(self):
+        tx = Transaction(None)
+        tx.log(DeltaEntry(("domain.count",), "SET", 2, 1))
+        entries = list(tx.delta_log)
+        self.assertEqual(len(tx.delta_log), 1)
+        self.assertEqual(entries[0].op, "SET")
+        self.assertEqual(entries[0].path, "domain.count")
+        self.assertEqual(entries[0].old_value, 1)
+
+    def test_bulk_path_export(self):
+        tx = Transaction(None)
+        root = TrackedDict(tx.get_shadow({"rows": [[0, 0], [0, 0]]}), tx, ("domain.grid",))
+        for i in range(2):
+            for j in range(2):
+                root["rows"][i][j] = 1
+        root["rows"][0:1][0].append(2)
+
+        paths = tx.delta_log.paths()
+        self.assertEqual(paths, [e.path for e in tx.delta_log])
+        self.assertEqual(paths[:2], ["domain.grid.rows[0][0]", "domain.grid.rows[0][1]"])
+
+    def test_delta_entry_accepts_string_path(self):
+        self.assertEqual(DeltaEntry("domain.count", "SET", 2, 1).path, "domain.count")
+        self.assertEqual(DeltaEntry(path="domain.count", op="SET").path_parts, ("domain.count",))
+
+        tx = Transaction(None)
+        tx.log(DeltaEntry("domain.items[0]", "SET", 1, 0))
+        self.assertEqual(tx.delta_log[0].path, "domain.items[0]")
+
+    def test_delta_log_append_takes_entries(self):
+        class Target:
+            count = 1
+        target = Target()
+        target.count = 2
+
+        tx = Transaction(None)
+        tx.delta_log.append(DeltaEntry("domain.count", "SET", 2, 1, target=target, key="count"))
+        self.assertEqual(tx.delta_log[0].op, "SET")
+
+        tx.rollback()
+        self.assertEqual(target.count, 1)
+
+    def test_delta_log_behaves_like_a_list(self):
+        tx = Transaction(None)
+        self.assertEqual(tx.delta_log, [])
+
+        entry = DeltaEntry("domain.x", "ADD", 1)
+        tx.log(entry)
+        self.assertIs(tx.delta_log[0], entry)
+        self.assertEqual(tx.delta_log[0].op, "ADD")
+
+        tx.record(OP_SET, ("domain.y",), 2, 1)
+        tx.delta_log[1].value = 3
+        self.assertEqual(tx.delta_log[1].value, 3)
+        self.assertIs(tx.delta_log[1], tx.delta_log[-1])
+
+        tx.delta_log.extend([DeltaEntry("domain.z", "SET", 4)])
+        self.assertEqual(len(tx.delta_log), 3)
+        self.assertEqual(tx.delta_log.pop().path, "domain.z")
+        self.assertEqual(tx.delta_log, [entry, DeltaEntry("domain.y", "SET", 3, 1)])
+
+    def test_rollback_after_inspecting_log(self):
+        class Target:
+            count = 1
+        target = Target()
+        target.count = 2
+
+        tx = Transaction(None)
+        tx.record(OP_SET, ("domain.count",), 2, 1, target, "count")
+        self.assertEqual(tx.delta_log[0].op, "SET")
+
+        tx.rollback()
+        self.assertEqual(target.count, 1)
+        self.assertEqual(tx.delta_log, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from dataclasses import dataclass, field
+from typing import Dict
+from pop import POPEngine, process, BaseSystemContext, BaseGlobalContext, BaseDomainContext
+
+@dataclass
+class MockGlobal(BaseGlobalContext):
+    pass
+
+@dataclass
+class MockDomain(BaseDomainContext):
+    table: Dict = field(default_factory=dict)
+    a: Dict = field(default_factory=dict)
+    b: Dict = field(default_factory=dict)
+
+@dataclass
+class MockSystem(BaseSystemContext):
+    pass
+
+@process(inputs=['domain.table'], outputs=['domain.table'])
+def p_update(ctx):
+    table = ctx.domain_ctx.table
+    table['b'] = 20
+    del table['c']
+    table['d'] = 4
+    table['nested'].append(3)
+    assert table['a'] == 1 and 'c' not in table
+    assert sorted(table) == ['a', 'b', 'd', 'nested']
+
+@process(inputs=['domain.table'], outputs=['domain.table'], errors=['ValueError'])
+def p_update_then_fail(ctx):
+    ctx.domain_ctx.table['a'] = 100
+    del ctx.domain_ctx.table['b']
+    ctx.domain_ctx.table['nested'].append(99)
+    raise ValueError("Boom!")
+
+@process(inputs=['domain.a', 'domain.b'], outputs=['domain.a', 'domain.b'])
+def p_write_aliases(ctx):
+    ctx.domain_ctx.b['inner']['y'] = 2
+    ctx.domain_ctx.a['z'] = 3
+
+@process(inputs=['domain.a', 'domain.b'], outputs=['domain.a', 'domain.b'])
+def p_read_alias(ctx):
+    ctx.domain_ctx.a['k'] = 1
+    assert ctx.domain_ctx.b['k'] == 1
+
+class TestDictMutation(unittest.TestCase):
+    def setUp(self):
+        self.original = {'a': 1, 'b': 2, 'c': 3, 'nested': [1, 2]}
+        self.dom = MockDomain(table=self.original)
+        self.engine = POPEngine(MockSystem(global_ctx=MockGlobal(), domain_ctx=self.dom))
+        self.engine.register_process("p_update", p_update)
+        self.engine.register_process("p_update_then_fail", p_update_then_fail)
+        self.engine.register_process("p_write_aliases", p_write_aliases)
+        self.engine.register_process("p_read_alias", p_read_alias)
+
+    def test_commit_applies_shadowed_writes(self):
+        self.engine.run_process("p_update")
+        self.assertIs(self.dom.table, self.original)
+        self.assertEqual(self.original, {'a': 1, 'b': 20, 'd': 4, 'nested': [1, 2, 3]})
+
+    def test_rollback_leaves_original_untouched(self):
+        with self.assertRaises(ValueError):
+            self.engine.run_process("p_update_then_fail")
+        self.assertEqual(self.original, {'a': 1, 'b': 2, 'c': 3, 'nested': [1, 2]})
+
+    def test_aliased_dict_writes_share_one_shadow(self):
+        shared = {}
+        with self.engine.edit():
+            self.dom.a = shared
+            self.dom.b = {'inner': shared}
+        self.engine.run_process("p_write_aliases")
+        self.assertEqual(shared, {'y': 2, 'z': 3})
+
+    def test_write_visible_through_alias(self):
+        shared = {}
+        with self.engine.edit():
+            self.dom.a = shared
+            self.dom.b = shared
+        self.engine.run_process("p_read_alias")
+        self.assertEqual(shared, {'k': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from dataclasses import dataclass
+from pop import POPEngine, process, ContractViolationError, BaseSystemContext, BaseGlobalContext, BaseDomainContext
+
+@dataclass
+class MockGlobal(BaseGlobalContext):
+    pass
+
+@dataclass
+class MockDomain(BaseDomainContext):
+    counter: int = 0
+    secret: str = "s3cr3t"
+
+@dataclass
+class MockSystem(BaseSystemContext):
+    pass
+
+@process(inputs=['domain.counter'], outputs=['domain.counter'])
+def p_add(ctx, amount=1):
+    ctx.domain_ctx.counter += amount
+    return ctx.domain_ctx.counter
+
+@process(inputs=['domain.counter'], outputs=['domain.counter'])
+def p_read_secret(ctx):
+    return ctx.domain_ctx.secret
+
+def p_plain_read_secret(ctx):
+    # No contract: runs directly on the context
+    return ctx.domain_ctx.secret
+
+def p_plain_add(ctx, amount=1):
+    ctx.domain_ctx.counter += amount
+
+class TestEngineDispatch(unittest.TestCase):
+    def setUp(self):
+        self.dom = MockDomain()
+        self.engine = POPEngine(MockSystem(global_ctx=MockGlobal(), domain_ctx=self.dom))
+        self.engine.register_process("p_add", p_add)
+
+    def test_contracted_dispatch_passes_kwargs_and_returns_result(self):
+        self.assertEqual(self.engine.run_process("p_add", amount=5), 5)
+        self.assertEqual(self.engine.run_process("p_add"), 6)
+        self.assertEqual(self.dom.counter, 6)
+
+    def test_contract_is_enforced_through_dispatcher(self):
+        self.engine.register_process("p_read_secret", p_read_secret)
+        with self.assertRaises(ContractViolationError) as cm:
+            self.engine.run_process("p_read_secret")
+        self.assertIn("[Process: p_read_secret]", str(cm.exception))
+
+    def test_reregister_contracted_as_plain(self):
+        self.engine.register_process("p", p_read_secret)
+        with self.assertRaises(ContractViolationError):
+            self.engine.run_process("p")
+
+        self.engine.register_process("p", p_plain_read_secret)
+        self.assertEqual(self.engine.run_process("p"), "s3cr3t")
+        self.assertIs(self.engine.process_registry["p"], p_plain_read_secret)
+
+    def test_reregister_plain_as_contracted(self):
+        self.engine.register_process("p", p_plain_read_secret)
+        self.assertEqual(self.engine.run_process("p"), "s3cr3t")
+
+        self.engine.register_process("p", p_read_secret)
+        with self.assertRaises(ContractViolationError):
+            self.engine.run_process("p")
+        self.assertIs(self.engine.process_registry["p"], p_read_secret)
+
+    def test_reassigned_ctx_reaches_both_dispatch_paths(self):
+        self.engine.register_process("p_plain_add", p_plain_add)
+        new_dom = MockDomain()
+        self.engine.ctx = MockSystem(global_ctx=MockGlobal(), domain_ctx=new_dom)
+
+        self.engine.run_process("p_add")
+        self.engine.run_process("p_plain_add")
+        self.assertEqual(new_dom.counter, 2)
+        self.assertEqual(self.dom.counter, 0)
+
+    def test_unknown_process_raises_key_error(self):
+        with self.assertRaises(KeyError) as cm:
+            self.engine.run_process("p_missing")
+        self.assertIn("p_missing", str(cm.exception))
+
+    def test_unknown_process_in_workflow_raises_key_error(self):
+        fd, path = tempfile.mkstemp(suffix=".yaml")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("steps:\n  - p_add\n  - p_missing\n")
+        try:
+            with self.assertRaises(KeyError):
+                self.engine.execute_workflow(path)
+            # Steps before the unknown one have already run
+            self.assertEqual(self.dom.counter, 1)
+        finally:
+            POPEngine._WF_CACHE.pop(path, None)
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
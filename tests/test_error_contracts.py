@@ -0,0 +1,81 @@
+import builtins
+import unittest
+from dataclasses import dataclass
+from pop import POPEngine, process, BaseSystemContext, BaseGlobalContext, BaseDomainContext, ContractViolationError
+
+@dataclass
+class MockGlobal(BaseGlobalContext):
+    pass
+
+@dataclass
+class MockDomain(BaseDomainContext):
+    pass
+
+@dataclass
+class MockSystem(BaseSystemContext):
+    pass
+
+class InventoryError(Exception):
+    pass
+
+class TimeoutError(Exception): # Shadows the builtin on purpose
+    pass
+
+@process(inputs=[], outputs=[], errors=['LookupError'])
+def raises_key_error(ctx):
+    raise KeyError("missing")
+
+@process(inputs=[], outputs=[], errors=[InventoryError])
+def raises_custom_class(ctx):
+    raise InventoryError("empty")
+
+@process(inputs=[], outputs=[], errors=['InventoryError'])
+def raises_custom_name(ctx):
+    raise InventoryError("empty")
+
+@process(inputs=[], outputs=[], errors=['ValueError'])
+def raises_undeclared(ctx):
+    raise TypeError("bad")
+
+@process(inputs=[], outputs=[], errors=[TimeoutError])
+def raises_builtin_timeout(ctx):
+    raise builtins.TimeoutError("slow")
+
+class TestErrorContracts(unittest.TestCase):
+    def setUp(self):
+        self.engine = POPEngine(MockSystem(global_ctx=MockGlobal(), domain_ctx=MockDomain()))
+        for name, func in [("raises_key_error", raises_key_error),
+                           ("raises_custom_class", raises_custom_class),
+                           ("raises_custom_name", raises_custom_name),
+                           ("raises_undeclared", raises_undeclared),
+                           ("raises_builtin_timeout", raises_builtin_timeout)]:
+            self.engine.register_process(name, func)
+
+    def test_subclass_of_declared_error_passes_through(self):
+        with self.assertRaises(KeyError):
+            self.engine.run_process("raises_key_error")
+
+    def test_declared_exception_class(self):
+        with self.assertRaises(InventoryError):
+            self.engine.run_process("raises_custom_class")
+
+    def test_declared_custom_name(self):
+        with self.assertRaises(InventoryError):
+            self.engine.run_process("raises_custom_name")
+
+    def test_undeclared_error_is_trapped(self):
+        with self.assertRaises(ContractViolationError):
+            self.engine.run_process("raises_undeclared")
+
+    def test_declared_class_does_not_match_same_named_error(self):
+        with self.assertRaises(ContractViolationError):
+            self.engine.run_process("raises_builtin_timeout")
+
+    def test_invalid_error_entries_rejected_at_decoration(self):
+        for bad in (42, None, int):
+            with self.assertRaises(TypeError) as cm:
+                process(inputs=[], outputs=[], errors=[bad])(lambda ctx: None)
+            self.assertIn("errors=[...]", str(cm.exception))
+
+if __name__ == '__main__':
+    unittest.main()
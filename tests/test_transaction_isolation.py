@@ -0,0 +1,84 @@
+import unittest
+from dataclasses import dataclass
+from pop import POPEngine, ContractViolationError, process, BaseSystemContext, BaseGlobalContext, BaseDomainContext
+
+@dataclass
+class MockGlobal(BaseGlobalContext):
+    pass
+
+@dataclass
+class MockDomain(BaseDomainContext):
+    counter: int = 0
+    items: list = None
+    secret: str = "s3cr3t"
+
+@dataclass
+class MockSystem(BaseSystemContext):
+    pass
+
+@process(inputs=['domain.counter'], outputs=['domain.counter'])
+def p_leak_domain(ctx):
+    return ctx.domain_ctx
+
+@process(inputs=['domain.counter'], outputs=['domain.counter'])
+def p_leak_ctx(ctx):
+    return ctx
+
+@process(inputs=['domain.counter'], outputs=['domain.counter'], errors=['ValueError'])
+def p_fail(ctx):
+    raise ValueError("boom")
+
+@process(inputs=['domain.secret'], outputs=[])
+def p_read_secret(ctx, probe):
+    probe()
+    return ctx.domain_ctx.secret
+
+@process(inputs=['domain.items'], outputs=['domain.items'])
+def p_append(ctx, value):
+    ctx.domain_ctx.items.append(value)
+
+class TestTransactionPerRun(unittest.TestCase):
+    def setUp(self):
+        self.dom = MockDomain(items=[])
+        self.engine = POPEngine(MockSystem(global_ctx=MockGlobal(), domain_ctx=self.dom))
+        self.engine.register_process("p_leak_domain", p_leak_domain)
+        self.engine.register_process("p_leak_ctx", p_leak_ctx)
+        self.engine.register_process("p_fail", p_fail)
+        self.engine.register_process("p_append", p_append)
+        self.engine.register_process("p_read_secret", p_read_secret)
+
+    def test_escaped_proxy_write_not_reverted_by_later_rollback(self):
+        leaked = self.engine.run_process("p_leak_domain")
+        with self.engine.lock_manager.unlock():
+            leaked.counter = 7
+
+        with self.assertRaises(ValueError):
+            self.engine.run_process("p_fail")
+        self.assertEqual(self.dom.counter, 7)
+
+    def test_repeated_runs_do_not_share_state(self):
+        for i in range(5):
+            self.engine.run_process("p_append", value=i)
+        self.assertEqual(self.dom.items, [0, 1, 2, 3, 4])
+
+        with self.assertRaises(ValueError):
+            self.engine.run_process("p_fail")
+        self.assertEqual(self.dom.items, [0, 1, 2, 3, 4])
+
+    def test_stashed_ctx_keeps_its_own_permissions(self):
+        stashed = self.engine.run_process("p_leak_ctx")
+        caught = []
+
+        def probe():
+            # Runs while a process that declares domain.secret is active
+            try:
+                stashed.domain_ctx.secret
+            except ContractViolationError as e:
+                caught.append(e)
+
+        self.assertEqual(self.engine.run_process("p_read_secret", probe=probe), "s3cr3t")
+        self.assertEqual(len(caught), 1)
+        self.assertIn("Illegal Read Violation", str(caught[0]))
+
+if __name__ == '__main__':
+    unittest.main()
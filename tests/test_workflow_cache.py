@@ -0,0 +1,159 @@
+import unittest
+import os
+import tempfile
+import yaml
+from dataclasses import dataclass
+from pop import POPEngine, process, BaseSystemContext, BaseGlobalContext, BaseDomainContext
+
+@dataclass
+class MockGlobal(BaseGlobalContext):
+    pass
+
+@dataclass
+class MockDomain(BaseDomainContext):
+    counter: int = 0
+
+@dataclass
+class MockSystem(BaseSystemContext):
+    pass
+
+@process(inputs=['domain.counter'], outputs=['domain.counter'])
+def p_increment(ctx):
+    ctx.domain_ctx.counter += 1
+
+@process(inputs=['domain.counter'], outputs=['domain.counter'])
+def p_decrement(ctx):
+    ctx.domain_ctx.counter -= 1
+
+class TestWorkflowCache(unittest.TestCase):
+    def setUp(self):
+        self.dom = MockDomain()
+        self.engine = POPEngine(MockSystem(global_ctx=MockGlobal(), domain_ctx=self.dom))
+        self.engine.register_process("p_increment", p_increment)
+        self.engine.register_process("p_decrement", p_decrement)
+
+        fd, self.path = tempfile.mkstemp(suffix=".yaml")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("steps:\n  - p_increment\n  - process: p_increment\n")
+
+    def tearDown(self):
+        POPEngine._WF_CACHE.pop(self.path, None)
+        os.remove(self.path)
+
+    def test_workflow_runs_and_is_cached(self):
+        self.engine.execute_workflow(self.path)
+        self.assertEqual(self.dom.counter, 2)
+        self.assertIn(self.path, POPEngine._WF_CACHE)
+
+        self.engine.execute_workflow(self.path)
+        self.assertEqual(self.dom.counter, 4)
+
+    def test_cache_invalidated_on_mtime_change(self):
+        self.engine.execute_workflow(self.path)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("steps:\n  - p_increment\n")
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        self.engine.execute_workflow(self.path)
+        self.assertEqual(self.dom.counter, 3)
+
+    def test_cache_invalidated_on_size_change_within_same_mtime(self):
+        self.engine.execute_workflow(self.path)
+        st = os.stat(self.path)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("steps:\n  - p_increment\n")
+        # Simulate a coarse-timestamp filesystem: mtime unchanged by the edit
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        self.engine.execute_workflow(self.path)
+        self.assertEqual(self.dom.counter, 3)
+
+    def test_relative_path_resolved_against_cwd(self):
+        # Same name, size and mtime in two directories: only the cwd tells them apart
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+            for d, name in ((dir_a, "p_increment"), (dir_b, "p_decrement")):
+                wf = os.path.join(d, "wf.yaml")
+                with open(wf, "w", encoding="utf-8") as f:
+                    f.write(f"steps:\n  - {name}\n")
+                os.utime(wf, ns=(0, 1_000_000_000))
+            keys = []
+            try:
+                for d in (dir_a, dir_b):
+                    os.chdir(d)
+                    keys.append(os.path.abspath("wf.yaml"))
+                    self.engine.execute_workflow("wf.yaml")
+            finally:
+                os.chdir(cwd)
+                for key in keys:
+                    POPEngine._WF_CACHE.pop(key, None)
+        self.assertEqual(self.dom.counter, 0)
+
+    def test_steps_parsed_from_full_document(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(
+                "name: \"Main\"\n"
+                "meta: {tags: [a, b], steps: ignored}\n"
+                "steps:\n"
+                "  - p_increment\n"
+                "  - process: p_increment\n"
+                "    args: {x: [1, 2]}\n"
+                "  - process: null\n"
+                "  - 123\n"
+                "description: trailing\n"
+            )
+        self.assertEqual(self.engine._load_workflow(self.path), ("p_increment", "p_increment"))
+
+    def _write(self, text):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_aliases_and_merge_keys(self):
+        self._write(
+            "base: &base {process: p_increment}\n"
+            "first: &first p_increment\n"
+            "steps:\n"
+            "  - *first\n"
+            "  - *base\n"
+            "  - {<<: *base, args: {x: 1}}\n"
+        )
+        self.assertEqual(self.engine._load_workflow(self.path), ("p_increment",) * 3)
+
+    def test_anchored_steps_list(self):
+        self._write(
+            "shared: &shared [p_increment, {process: p_increment}]\n"
+            "steps: *shared\n"
+        )
+        self.assertEqual(self.engine._load_workflow(self.path), ("p_increment", "p_increment"))
+
+    def test_duplicate_steps_key_last_wins(self):
+        self._write("steps: [p_missing]\nsteps: [p_increment]\n")
+        self.assertEqual(self.engine._load_workflow(self.path), ("p_increment",))
+
+    def test_malformed_yaml_after_steps_raises(self):
+        self._write("steps: [p_increment]\nfoo: [unclosed\n")
+        with self.assertRaises(yaml.YAMLError):
+            self.engine.execute_workflow(self.path)
+        self.assertEqual(self.dom.counter, 0)
+
+    def test_non_string_process_name_is_not_skipped(self):
+        self._write("steps:\n  - process: 123\n")
+        with self.assertRaises(KeyError):
+            self.engine.execute_workflow(self.path)
+
+    def test_json_workflow(self):
+        fd, json_path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write('{"name": "Main", "steps": ["p_increment", {"process": "p_increment"}, {"process": null}]}')
+        try:
+            self.engine.execute_workflow(json_path)
+            self.assertEqual(self.dom.counter, 2)
+        finally:
+            POPEngine._WF_CACHE.pop(json_path, None)
+            os.remove(json_path)
+
+if __name__ == '__main__':
+    unittest.main()